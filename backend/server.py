@@ -1,24 +1,35 @@
 """FastAPI server exposing AI agent endpoints."""
 
+import asyncio
+import base64
+import hashlib
+import hmac
 import logging
 import os
+import secrets
+import sys
+import time
 import uuid
 from contextlib import asynccontextmanager
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
+from cachetools import TTLCache
 from dotenv import load_dotenv
-from fastapi import APIRouter, FastAPI, HTTPException, Request
-from motor.motor_asyncio import AsyncIOMotorClient
+from fastapi import APIRouter, FastAPI, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import numpy as np
+import orjson
 from pydantic import BaseModel, Field
+from pymongo import AsyncMongoClient
+from pymongo.errors import DuplicateKeyError
 from starlette.middleware.cors import CORSMiddleware
 
 from ai_agents.agents import AgentConfig, ChatAgent, SearchAgent
-import random
 from datetime import timedelta
 import bcrypt
-import jwt
 
 
 logging.basicConfig(
@@ -28,6 +39,16 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 ROOT_DIR = Path(__file__).parent
+# Loaded at import so settings read while building the app (such as CORS) see it
+load_dotenv(ROOT_DIR / ".env")
+
+DEFAULT_CORS_ORIGINS = "http://localhost:3000"
+CORS_ORIGINS = [origin.strip() for origin in os.getenv("CORS_ORIGINS", DEFAULT_CORS_ORIGINS).split(",") if origin.strip()]
+if "CORS_ORIGINS" not in os.environ:
+    logger.warning("CORS_ORIGINS is not set; only %s may call the API from a browser", DEFAULT_CORS_ORIGINS)
+
+# Mock data is drawn in batches from a single PCG64 generator.
+RNG = np.random.default_rng()
 
 
 class StatusCheck(BaseModel):
@@ -88,41 +109,35 @@ class AuthResponse(BaseModel):
     error: Optional[str] = None
 
 
-# Staking Models
-class StakingAsset(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    user_id: str
-    asset_name: str
-    asset_symbol: str
-    amount_staked: float
-    current_value: float
-    apy: float
-    rewards_earned: float
-    staking_date: datetime
-    logo_url: Optional[str] = None
-
-
-class StakingOverview(BaseModel):
-    total_staked_value: float
-    total_rewards_earned: float
-    average_apy: float
-    total_assets: int
-    performance_change_24h: float
-
-
-class RewardHistory(BaseModel):
-    date: str
-    amount: float
-    asset_symbol: str
-
-
-class PerformanceData(BaseModel):
-    date: str
-    value: float
-
-
 JWT_SECRET = os.getenv("JWT_SECRET", "your-secret-key-change-in-production")
-JWT_ALGORITHM = "HS256"
+JWT_LIFETIME = timedelta(days=7)
+JWT_SECRET_BYTES = JWT_SECRET.encode()
+
+# Only HS256 is issued, so tokens are signed and verified directly with hmac
+# and orjson. Every token shares this header, so it is encoded once.
+JWT_HEADER_B64 = base64.urlsafe_b64encode(orjson.dumps({"alg": "HS256", "typ": "JWT"})).rstrip(b"=")
+_JWT_HEADER_PREFIX = JWT_HEADER_B64.decode() + "."
+# Keyed once; copying it reuses the derived inner and outer pads for each token.
+_HMAC_TEMPLATE = hmac.new(JWT_SECRET_BYTES, digestmod=hashlib.sha256)
+
+# (payload, revoked) keyed by a digest of the raw token, so repeat requests skip
+# signature verification and the revocation lookup. Other workers therefore see
+# a logout within the TTL; the worker that handled it evicts its entry at once.
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
+# Recent successful logins keyed by a digest of the credentials, so a repeat
+# login within the TTL skips bcrypt. Failed attempts are counted per email and
+# client address to turn away credential stuffing before it reaches bcrypt,
+# without letting one client lock the owner out everywhere.
+MAX_FAILED_LOGINS = 5
+_CREDENTIAL_DIGEST_KEY = secrets.token_bytes(32)
+_login_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+_failed_logins: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+# Per throttle key: the lock serializing password checks and how many attempts hold or await it.
+_login_locks: Dict[bytes, Tuple[asyncio.Lock, int]] = {}
+
+# Mock staking positions per user id, so repeat dashboard loads reuse one draw.
+_staking_data_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
 
 
 def _ensure_db(request: Request):
@@ -132,103 +147,266 @@ def _ensure_db(request: Request):
         raise HTTPException(status_code=503, detail="Database not ready") from exc
 
 
+def _b64url_encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _sign(signing_input: bytes) -> bytes:
+    signer = _HMAC_TEMPLATE.copy()
+    signer.update(signing_input)
+    return signer.digest()
+
+
 def _create_token(user_id: str, username: str) -> str:
     payload = {
         "user_id": user_id,
         "username": username,
-        "exp": datetime.now(timezone.utc) + timedelta(days=7)
+        "jti": uuid.uuid4().hex,
+        "exp": int((datetime.now(timezone.utc) + JWT_LIFETIME).timestamp()),
     }
-    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    signing_input = JWT_HEADER_B64 + b"." + _b64url_encode(orjson.dumps(payload))
+    return (signing_input + b"." + _b64url_encode(_sign(signing_input))).decode()
 
 
-def _verify_token(token: str) -> Optional[dict]:
+def _credential_digest(email: str, password: str = "") -> bytes:
+    material = f"{len(email)}:{email}{password}".encode()
+    return hashlib.blake2b(material, key=_CREDENTIAL_DIGEST_KEY, digest_size=32).digest()
+
+
+def _login_throttle_key(email: str, request: Request) -> bytes:
+    client = getattr(request, "client", None)
+    return _credential_digest(email, client.host if client else "")
+
+
+@asynccontextmanager
+async def _login_attempt(throttle_key: bytes):
+    """Run password checks for one throttle key one at a time."""
+    lock, holders = _login_locks.get(throttle_key, (None, 0))
+    lock = lock or asyncio.Lock()
+    _login_locks[throttle_key] = (lock, holders + 1)
     try:
-        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-    except jwt.InvalidTokenError:
+        async with lock:
+            yield
+    finally:
+        lock, holders = _login_locks[throttle_key]
+        if holders == 1:
+            del _login_locks[throttle_key]
+        else:
+            _login_locks[throttle_key] = (lock, holders - 1)
+
+
+def _token_cache_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _decode_token(token: str) -> Optional[dict]:
+    if not token.startswith(_JWT_HEADER_PREFIX):
         return None
 
+    signing_input, _, signature = token.rpartition(".")
+    try:
+        if not hmac.compare_digest(_sign(signing_input.encode()), _b64url_decode(signature)):
+            return None
+        payload = orjson.loads(_b64url_decode(signing_input[len(_JWT_HEADER_PREFIX):]))
+    except ValueError:
+        return None
+    if not isinstance(payload, dict) or not isinstance(payload.get("exp"), (int, float)):
+        return None
+    return payload
+
 
-def _get_user_from_token(request: Request) -> dict:
+def _verify_token(token: str) -> Optional[dict]:
+    payload = _decode_token(token)
+    if payload is None or payload["exp"] <= time.time():
+        return None
+    return payload
+
+
+async def _authenticate_token(db, token: str) -> Optional[dict]:
+    """Verify the token and check it has not been revoked, caching both results."""
+    key = _token_cache_key(token)
+    cached = _token_cache.get(key)
+    if cached is None:
+        payload = _verify_token(token)
+        if payload is None:
+            return None
+        jti = payload.get("jti")
+        revoked = bool(jti) and await db.revoked_tokens.find_one({"_id": jti}, {"_id": 1}) is not None
+        cached = _token_cache[key] = (payload, revoked)
+
+    payload, revoked = cached
+    if revoked or payload["exp"] <= time.time():
+        return None
+    return payload
+
+
+async def _revoke_token(db, payload: dict) -> bool:
+    """Record the token's id as revoked until it expires; False if it has no id."""
+    jti = payload.get("jti")
+    if not jti:
+        return False
+    # The TTL index on expires_at drops the entry once the token could no longer verify anyway
+    await db.revoked_tokens.update_one(
+        {"_id": jti},
+        {"$set": {"expires_at": datetime.fromtimestamp(payload["exp"], timezone.utc)}},
+        upsert=True,
+    )
+    return True
+
+
+def _bearer_token(request: Request) -> str:
     auth_header = request.headers.get("Authorization")
     if not auth_header or not auth_header.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
 
-    token = auth_header.split(" ")[1]
-    payload = _verify_token(token)
+    return auth_header.split(" ")[1]
+
+
+async def _get_user_from_token(request: Request) -> dict:
+    payload = await _authenticate_token(_ensure_db(request), _bearer_token(request))
     if not payload:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
     return payload
 
 
-def _generate_mock_staking_data(user_id: str) -> List[dict]:
-    """Generate realistic mock staking data for a user."""
-    assets = [
-        {"name": "Ethereum", "symbol": "ETH", "logo": "https://images.unsplash.com/photo-1622630998477-20aa696ecb05?w=100"},
-        {"name": "Polkadot", "symbol": "DOT", "logo": "https://images.unsplash.com/photo-1639762681485-074b7f938ba0?w=100"},
-        {"name": "Cardano", "symbol": "ADA", "logo": "https://images.unsplash.com/photo-1621416894569-0f39ed31d247?w=100"},
-        {"name": "Solana", "symbol": "SOL", "logo": "https://images.unsplash.com/photo-1639762681057-408e52192e55?w=100"},
-        {"name": "Cosmos", "symbol": "ATOM", "logo": "https://images.unsplash.com/photo-1640826514546-7d2b75c88886?w=100"},
-    ]
+def _user_seed(user_id: str) -> int:
+    return int.from_bytes(hashlib.blake2b(user_id.encode(), digest_size=8).digest(), "big")
 
-    staking_data = []
-    for asset in assets:
-        amount = random.uniform(10, 500)
-        price = random.uniform(50, 3000)
-        apy = random.uniform(4.5, 15.0)
-        days_staked = random.randint(30, 365)
 
+# Column order of the value array returned alongside the staking positions.
+_VALUE_COLUMN, _REWARDS_COLUMN, _APY_COLUMN = range(3)
+
+
+def _generate_mock_staking_data(user_id: str) -> Tuple[List[dict], np.ndarray]:
+    """Return the user's mock staking positions, generating them on first use.
+
+    Alongside the positions comes a ``(len(positions), 3)`` float array holding
+    each position's current value, rewards earned and APY, for aggregation.
+    """
+    cached = _staking_data_cache.get(user_id)
+    if cached is None:
+        cached = _draw_mock_staking_data(user_id)
+        _staking_data_cache[user_id] = cached
+
+    # Callers overlay live prices onto the positions, so hand out copies.
+    staking_data, values = cached
+    return [dict(asset) for asset in staking_data], values.copy()
+
+
+def _apply_real_staking_data(staking_data: List[dict], values: np.ndarray, real_data: dict) -> None:
+    """Overlay scraped APY and price data onto the positions and their value array."""
+    for row, asset in enumerate(staking_data):
+        symbol = asset["asset_symbol"]
+        if symbol in real_data:
+            asset["apy"] = real_data[symbol].get("apy", asset["apy"])
+            price = real_data[symbol].get("price", asset["current_value"] / asset["amount_staked"])
+            asset["current_value"] = round(asset["amount_staked"] * price, 2)
+            values[row, _VALUE_COLUMN] = asset["current_value"]
+            values[row, _APY_COLUMN] = asset["apy"]
+
+
+STAKING_ASSETS = [
+    {"name": "Ethereum", "symbol": "ETH", "logo": "https://images.unsplash.com/photo-1622630998477-20aa696ecb05?w=100"},
+    {"name": "Polkadot", "symbol": "DOT", "logo": "https://images.unsplash.com/photo-1639762681485-074b7f938ba0?w=100"},
+    {"name": "Cardano", "symbol": "ADA", "logo": "https://images.unsplash.com/photo-1621416894569-0f39ed31d247?w=100"},
+    {"name": "Solana", "symbol": "SOL", "logo": "https://images.unsplash.com/photo-1639762681057-408e52192e55?w=100"},
+    {"name": "Cosmos", "symbol": "ATOM", "logo": "https://images.unsplash.com/photo-1640826514546-7d2b75c88886?w=100"},
+]
+REWARD_ASSET_SYMBOLS = np.array([asset["symbol"] for asset in STAKING_ASSETS])
+
+
+def _draw_mock_staking_data(user_id: str) -> Tuple[List[dict], np.ndarray]:
+    """Generate realistic mock staking data for a user, seeded by their id."""
+    rng = np.random.default_rng(_user_seed(user_id))
+    count = len(STAKING_ASSETS)
+    amounts = rng.uniform(10, 500, size=count)
+    prices = rng.uniform(50, 3000, size=count)
+    apys = rng.uniform(4.5, 15.0, size=count)
+    days_staked = rng.integers(30, 365, size=count, endpoint=True)
+    rewards = amounts * (apys / 100) * (days_staked / 365)
+    values = np.round(np.column_stack((amounts * prices, rewards, apys)), 2)
+    now = np.datetime64(datetime.now(timezone.utc).replace(tzinfo=None), "us")
+    staking_dates = (now - days_staked.astype("timedelta64[D]")).astype(str)
+
+    staking_data = []
+    for asset, amount, (value, reward, apy), staking_date in zip(
+        STAKING_ASSETS,
+        np.round(amounts, 2).tolist(),
+        values.tolist(),
+        staking_dates.tolist(),
+    ):
         staking_data.append({
-            "id": str(uuid.uuid4()),
+            "id": str(uuid.UUID(bytes=rng.bytes(16), version=4)),
             "user_id": user_id,
             "asset_name": asset["name"],
             "asset_symbol": asset["symbol"],
-            "amount_staked": round(amount, 2),
-            "current_value": round(amount * price, 2),
-            "apy": round(apy, 2),
-            "rewards_earned": round(amount * (apy / 100) * (days_staked / 365), 2),
-            "staking_date": (datetime.now(timezone.utc) - timedelta(days=days_staked)).isoformat(),
+            "amount_staked": amount,
+            "current_value": value,
+            "apy": apy,
+            "rewards_earned": reward,
+            "staking_date": f"{staking_date}+00:00",
             "logo_url": asset["logo"],
         })
 
-    return staking_data
+    return staking_data, values
+
+
+# Longest history the staking endpoints serve, which also bounds each _date_strings entry
+MAX_HISTORY_DAYS = 365
+
+
+# Room for the spread of ranges dashboard users pick; each entry is at most MAX_HISTORY_DAYS strings
+@lru_cache(maxsize=32)
+def _date_strings(today: date, days: int) -> Tuple[str, ...]:
+    """Return the ``days`` ISO dates before ``today``, oldest first."""
+    return tuple((np.datetime64(today, "D") - np.arange(days, 0, -1)).astype(str).tolist())
+
+
+def _recent_dates(days: int) -> Tuple[str, ...]:
+    return _date_strings(datetime.now(timezone.utc).date(), days)
 
 
 def _generate_rewards_history(days: int = 30) -> List[dict]:
     """Generate mock rewards history."""
-    history = []
-    assets = ["ETH", "DOT", "ADA", "SOL", "ATOM"]
-
-    for i in range(days):
-        date = datetime.now(timezone.utc) - timedelta(days=days - i)
-        history.append({
-            "date": date.strftime("%Y-%m-%d"),
-            "amount": round(random.uniform(0.5, 5.0), 2),
-            "asset_symbol": random.choice(assets),
-        })
+    amounts = np.round(RNG.uniform(0.5, 5.0, size=days), 2).tolist()
+    symbols = REWARD_ASSET_SYMBOLS[RNG.integers(0, len(REWARD_ASSET_SYMBOLS), size=days)].tolist()
 
-    return history
+    return [
+        {"date": day, "amount": amount, "asset_symbol": symbol}
+        for day, amount, symbol in zip(_recent_dates(days), amounts, symbols)
+    ]
 
 
 def _generate_performance_data(days: int = 30, start_value: float = 50000) -> List[dict]:
     """Generate mock performance data with realistic trends."""
-    performance = []
-    current_value = start_value
-
-    for i in range(days):
-        date = datetime.now(timezone.utc) - timedelta(days=days - i)
-        # Add some volatility
-        change = random.uniform(-0.02, 0.03)  # -2% to +3% daily change
-        current_value *= (1 + change)
+    # -2% to +3% daily change, compounded from the start value
+    changes = RNG.uniform(-0.02, 0.03, size=days)
+    values = np.round(start_value * np.cumprod(1 + changes), 2).tolist()
 
+    performance = []
+    for day, value in zip(_recent_dates(days), values):
         performance.append({
-            "date": date.strftime("%Y-%m-%d"),
-            "value": round(current_value, 2),
+            "date": day,
+            "value": value,
         })
 
     return performance
 
 
+async def _stream_json_array(documents) -> AsyncIterator[bytes]:
+    """Encode documents from an async cursor as a JSON array, one at a time."""
+    separator = b"["
+    async for document in documents:
+        yield separator + orjson.dumps(document)
+        separator = b","
+    yield b"[]" if separator == b"[" else b"]"
+
+
 def _get_agent_cache(request: Request) -> Dict[str, object]:
     if not hasattr(request.app.state, "agent_cache"):
         request.app.state.agent_cache = {}
@@ -254,7 +432,9 @@ async def _get_or_create_agent(request: Request, agent_type: str):
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    load_dotenv(ROOT_DIR / ".env")
+    # uvloop has no Windows build, so only expect it elsewhere
+    if sys.platform != "win32" and not type(asyncio.get_running_loop()).__module__.startswith("uvloop"):
+        logger.warning("Not running on uvloop; start uvicorn with --loop uvloop --http httptools")
 
     mongo_url = os.getenv("MONGO_URL")
     db_name = os.getenv("DB_NAME")
@@ -263,17 +443,22 @@ async def lifespan(app: FastAPI):
         missing = [name for name, value in {"MONGO_URL": mongo_url, "DB_NAME": db_name}.items() if not value]
         raise RuntimeError(f"Missing required environment variables: {', '.join(missing)}")
 
-    client = AsyncIOMotorClient(mongo_url)
+    client = AsyncMongoClient(mongo_url, maxPoolSize=50, minPoolSize=10)
 
     try:
         app.state.mongo_client = client
         app.state.db = client[db_name]
+        # Open the pool before the first request rather than during it
+        await client.admin.command("ping")
+        await app.state.db.users.create_index("email", unique=True)
+        await app.state.db.revoked_tokens.create_index("expires_at", expireAfterSeconds=0)
+        app.state.bcrypt_rounds = int(os.getenv("BCRYPT_ROUNDS", "12"))
         app.state.agent_config = AgentConfig()
         app.state.agent_cache = {}
         logger.info("AI Agents API starting up")
         yield
     finally:
-        client.close()
+        await client.close()
         logger.info("AI Agents API shutdown complete")
 
 
@@ -281,6 +466,16 @@ app = FastAPI(
     title="AI Agents API",
     description="Minimal AI Agents API with LangGraph and MCP support",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_credentials=True,
+    allow_origins=CORS_ORIGINS,
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,
 )
 
 api_router = APIRouter(prefix="/api")
@@ -302,8 +497,9 @@ async def create_status_check(input: StatusCheckCreate, request: Request):
 @api_router.get("/status", response_model=List[StatusCheck])
 async def get_status_checks(request: Request):
     db = _ensure_db(request)
-    status_checks = await db.status_checks.find().to_list(1000)
-    return [StatusCheck(**status_check) for status_check in status_checks]
+    # Stored documents already match StatusCheck, so stream them without re-validating
+    cursor = db.status_checks.find({}, {"_id": 0}).limit(1000)
+    return StreamingResponse(_stream_json_array(cursor), media_type="application/json")
 
 
 @api_router.post("/chat", response_model=ChatResponse)
@@ -399,13 +595,17 @@ async def signup(user_data: UserSignup, request: Request):
     try:
         db = _ensure_db(request)
 
-        # Check if user exists
-        existing_user = await db.users.find_one({"email": user_data.email})
+        # Check if user exists before paying for bcrypt
+        existing_user = await db.users.find_one({"email": user_data.email}, {"_id": 1})
         if existing_user:
             return AuthResponse(success=False, error="Email already registered")
 
         # Hash password
-        hashed_password = bcrypt.hashpw(user_data.password.encode('utf-8'), bcrypt.gensalt())
+        hashed_password = await asyncio.to_thread(
+            bcrypt.hashpw,
+            user_data.password.encode('utf-8'),
+            bcrypt.gensalt(rounds=request.app.state.bcrypt_rounds),
+        )
 
         # Create user
         user_id = str(uuid.uuid4())
@@ -417,7 +617,11 @@ async def signup(user_data: UserSignup, request: Request):
             "created_at": datetime.now(timezone.utc),
         }
 
-        await db.users.insert_one(user)
+        # The unique index on email still catches a signup racing this one past the check above
+        try:
+            await db.users.insert_one(user)
+        except DuplicateKeyError:
+            return AuthResponse(success=False, error="Email already registered")
 
         # Generate token
         token = _create_token(user_id, user_data.username)
@@ -433,24 +637,54 @@ async def login(credentials: UserLogin, request: Request):
     try:
         db = _ensure_db(request)
 
-        # Find user
-        user = await db.users.find_one({"email": credentials.email})
-        if not user:
-            return AuthResponse(success=False, error="Invalid email or password")
-
-        # Verify password
-        if not bcrypt.checkpw(credentials.password.encode('utf-8'), user["password"].encode('utf-8')):
-            return AuthResponse(success=False, error="Invalid email or password")
+        credential_key = _credential_digest(credentials.email, credentials.password)
+        cached = _login_cache.get(credential_key)
+        if not cached:
+            throttle_key = _login_throttle_key(credentials.email, request)
+            # One check at a time per key, so each attempt sees every failure before it
+            async with _login_attempt(throttle_key):
+                # An overlapping attempt with the same credentials may have just succeeded
+                cached = _login_cache.get(credential_key)
+                if not cached:
+                    if _failed_logins.get(throttle_key, 0) >= MAX_FAILED_LOGINS:
+                        return AuthResponse(success=False, error="Too many login attempts, try again later")
+
+                    # Find user
+                    user = await db.users.find_one({"email": credentials.email})
+
+                    # Verify password
+                    password_ok = user is not None and await asyncio.to_thread(
+                        bcrypt.checkpw,
+                        credentials.password.encode('utf-8'),
+                        user["password"].encode('utf-8'),
+                    )
+                    if not password_ok:
+                        _failed_logins[throttle_key] = _failed_logins.get(throttle_key, 0) + 1
+                        return AuthResponse(success=False, error="Invalid email or password")
+
+                    cached = _login_cache[credential_key] = (user["id"], user["username"])
+                    _failed_logins.pop(throttle_key, None)
+
+        user_id, username = cached
 
         # Generate token
-        token = _create_token(user["id"], user["username"])
+        token = _create_token(user_id, username)
 
-        return AuthResponse(success=True, token=token, username=user["username"])
+        return AuthResponse(success=True, token=token, username=username)
     except Exception as exc:
         logger.exception("Error in login")
         return AuthResponse(success=False, error=str(exc))
 
 
+@api_router.post("/auth/logout")
+async def logout(request: Request):
+    user = await _get_user_from_token(request)
+    if not await _revoke_token(_ensure_db(request), user):
+        return {"success": False, "error": "Token predates logout support and cannot be revoked"}
+    _token_cache.pop(_token_cache_key(_bearer_token(request)), None)
+    return {"success": True}
+
+
 async def _scrape_real_staking_data(request: Request) -> List[dict]:
     """Scrape real staking data using web search MCP."""
     try:
@@ -501,33 +735,29 @@ async def _scrape_real_staking_data(request: Request) -> List[dict]:
 @api_router.get("/staking/overview")
 async def get_staking_overview(request: Request):
     try:
-        user = _get_user_from_token(request)
+        user = await _get_user_from_token(request)
         db = _ensure_db(request)
 
         # Try to get real data, fallback to mock
         real_data = await _scrape_real_staking_data(request)
 
         # Generate staking positions using real or mock data
-        staking_data = _generate_mock_staking_data(user["user_id"])
+        staking_data, values = _generate_mock_staking_data(user["user_id"])
 
         # Update with real data if available
         if real_data:
-            for asset in staking_data:
-                symbol = asset["asset_symbol"]
-                if symbol in real_data:
-                    asset["apy"] = real_data[symbol].get("apy", asset["apy"])
-                    price = real_data[symbol].get("price", asset["current_value"] / asset["amount_staked"])
-                    asset["current_value"] = round(asset["amount_staked"] * price, 2)
+            _apply_real_staking_data(staking_data, values, real_data)
 
         # Calculate overview
-        total_staked = sum(asset["current_value"] for asset in staking_data)
-        total_rewards = sum(asset["rewards_earned"] for asset in staking_data)
-        avg_apy = sum(asset["apy"] for asset in staking_data) / len(staking_data) if staking_data else 0
+        totals = values.sum(axis=0)
+        total_staked = float(totals[_VALUE_COLUMN])
+        total_rewards = float(totals[_REWARDS_COLUMN])
+        avg_apy = float(totals[_APY_COLUMN]) / len(staking_data) if staking_data else 0
 
         # Generate performance change (mock)
-        performance_change = random.uniform(-5.0, 8.0)
+        performance_change = float(RNG.uniform(-5.0, 8.0))
 
-        return {
+        return ORJSONResponse({
             "success": True,
             "data": {
                 "total_staked_value": round(total_staked, 2),
@@ -536,7 +766,7 @@ async def get_staking_overview(request: Request):
                 "total_assets": len(staking_data),
                 "performance_change_24h": round(performance_change, 2),
             }
-        }
+        })
     except HTTPException:
         raise
     except Exception as exc:
@@ -547,27 +777,22 @@ async def get_staking_overview(request: Request):
 @api_router.get("/staking/assets")
 async def get_staking_assets(request: Request):
     try:
-        user = _get_user_from_token(request)
+        user = await _get_user_from_token(request)
 
         # Try to get real data
         real_data = await _scrape_real_staking_data(request)
 
         # Generate mock staking data
-        staking_data = _generate_mock_staking_data(user["user_id"])
+        staking_data, values = _generate_mock_staking_data(user["user_id"])
 
         # Update with real data if available
         if real_data:
-            for asset in staking_data:
-                symbol = asset["asset_symbol"]
-                if symbol in real_data:
-                    asset["apy"] = real_data[symbol].get("apy", asset["apy"])
-                    price = real_data[symbol].get("price", asset["current_value"] / asset["amount_staked"])
-                    asset["current_value"] = round(asset["amount_staked"] * price, 2)
+            _apply_real_staking_data(staking_data, values, real_data)
 
-        return {
+        return ORJSONResponse({
             "success": True,
             "data": staking_data,
-        }
+        })
     except HTTPException:
         raise
     except Exception as exc:
@@ -576,17 +801,17 @@ async def get_staking_assets(request: Request):
 
 
 @api_router.get("/staking/rewards-history")
-async def get_rewards_history(request: Request, days: int = 30):
+async def get_rewards_history(request: Request, days: int = Query(30, ge=0, le=MAX_HISTORY_DAYS)):
     try:
-        user = _get_user_from_token(request)
+        user = await _get_user_from_token(request)
 
         # Generate mock rewards history
         history = _generate_rewards_history(days)
 
-        return {
+        return ORJSONResponse({
             "success": True,
             "data": history,
-        }
+        })
     except HTTPException:
         raise
     except Exception as exc:
@@ -595,17 +820,17 @@ async def get_rewards_history(request: Request, days: int = 30):
 
 
 @api_router.get("/staking/performance")
-async def get_performance_data(request: Request, days: int = 30):
+async def get_performance_data(request: Request, days: int = Query(30, ge=0, le=MAX_HISTORY_DAYS)):
     try:
-        user = _get_user_from_token(request)
+        user = await _get_user_from_token(request)
 
         # Generate mock performance data
         performance = _generate_performance_data(days)
 
-        return {
+        return ORJSONResponse({
             "success": True,
             "data": performance,
-        }
+        })
     except HTTPException:
         raise
     except Exception as exc:
@@ -615,10 +840,14 @@ async def get_performance_data(request: Request, days: int = 30):
 
 app.include_router(api_router)
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_credentials=True,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(
+        app,
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8001")),
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+    )
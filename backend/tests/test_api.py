@@ -3,7 +3,7 @@
 ⚠️  IMPORTANT: These tests require the server to be running!
 
 To run these tests:
-1. Terminal 1: cd backend && uvicorn server:app --reload --port 8001
+1. Terminal 1: cd backend && uvicorn server:app --loop uvloop --http httptools --reload --port 8001
 2. Terminal 2: cd backend && python -m pytest tests/test_api.py -v
 
 If the server is NOT running, tests will fail with "Connection refused" - this is expected!
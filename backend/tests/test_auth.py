@@ -0,0 +1,276 @@
+"""Unit tests for token handling and logout (no server or database required)."""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import bcrypt
+import pytest
+from fastapi import HTTPException
+
+# Ensure backend package is on sys.path when invoked from repo root
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import server
+
+
+class FakeCollection:
+    """Just enough of a Mongo collection for the auth code paths."""
+
+    def __init__(self):
+        self.docs = []
+
+    def _matches(self, doc, query):
+        return all(doc.get(key) == value for key, value in query.items())
+
+    async def find_one(self, query, projection=None):
+        for doc in self.docs:
+            if self._matches(doc, query):
+                return dict(doc)
+        return None
+
+    async def insert_one(self, doc):
+        self.docs.append(dict(doc))
+
+    async def update_one(self, query, update, upsert=False):
+        for doc in self.docs:
+            if self._matches(doc, query):
+                doc.update(update.get("$set", {}))
+                return
+        if upsert:
+            self.docs.append({**query, **update.get("$set", {})})
+
+
+class FakeDB:
+    def __init__(self):
+        self.users = FakeCollection()
+        self.revoked_tokens = FakeCollection()
+
+
+def sign_payload(payload, header_b64=server.JWT_HEADER_B64):
+    """Build an HS256 token for an arbitrary payload with the server's secret."""
+    signing_input = header_b64 + b"." + server._b64url_encode(server.orjson.dumps(payload))
+    return (signing_input + b"." + server._b64url_encode(server._sign(signing_input))).decode()
+
+
+def tamper(segment):
+    """Flip the first character of a base64url segment."""
+    return ("B" if segment[0] == "A" else "A") + segment[1:]
+
+
+def make_request(db, token=None):
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    return SimpleNamespace(headers=headers, app=SimpleNamespace(state=SimpleNamespace(db=db, bcrypt_rounds=4)))
+
+
+# Minted with PyJWT 2.x under the default development secret before the switch.
+PYJWT_TOKEN = (
+    "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9"
+    ".eyJ1c2VyX2lkIjoibGVnYWN5LXVzZXIiLCJ1c2VybmFtZSI6ImxlZ2FjeSIsImV4cCI6NDEwMjQ0NDgwMH0"
+    ".74n6LKl_R06KsxaBpMvhy2_69QNRgxWAvWe-j-2fs3E"
+)
+
+
+def test_created_token_round_trips():
+    payload = server._verify_token(server._create_token("user-1", "alice"))
+
+    assert payload["user_id"] == "user-1"
+    assert payload["username"] == "alice"
+    assert payload["jti"]
+    assert payload["exp"] > time.time()
+
+
+def test_tampered_signature_is_rejected():
+    header, body, signature = server._create_token("user-1", "alice").split(".")
+
+    assert server._verify_token(f"{header}.{body}.{tamper(signature)}") is None
+
+
+def test_tampered_payload_is_rejected():
+    header, _, signature = server._create_token("user-1", "alice").split(".")
+    forged = server._b64url_encode(
+        server.orjson.dumps({"user_id": "admin", "username": "admin", "exp": 4102444800})
+    ).decode()
+
+    assert server._verify_token(f"{header}.{forged}.{signature}") is None
+
+
+def test_foreign_header_is_rejected():
+    header_b64 = server._b64url_encode(server.orjson.dumps({"alg": "HS256", "typ": "JWT", "kid": "other"}))
+    token = sign_payload({"user_id": "user-1", "exp": 4102444800}, header_b64=header_b64)
+
+    assert server._verify_token(token) is None
+
+
+@pytest.mark.parametrize("payload", [
+    {"user_id": "user-1"},
+    {"user_id": "user-1", "exp": "4102444800"},
+    {"user_id": "user-1", "exp": None},
+])
+def test_missing_or_non_numeric_exp_is_rejected(payload):
+    assert server._verify_token(sign_payload(payload)) is None
+
+
+def test_expired_token_is_rejected():
+    token = sign_payload({"user_id": "user-1", "exp": int(time.time()) - 1})
+
+    assert server._verify_token(token) is None
+
+
+@pytest.mark.skipif(
+    server.JWT_SECRET != "your-secret-key-change-in-production",
+    reason="PYJWT_TOKEN was signed with the default development secret",
+)
+def test_pyjwt_minted_token_still_verifies():
+    payload = server._verify_token(PYJWT_TOKEN)
+
+    assert payload == {"user_id": "legacy-user", "username": "legacy", "exp": 4102444800}
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_token():
+    db = FakeDB()
+    token = server._create_token("user-1", "alice")
+    request = make_request(db, token)
+
+    assert (await server._get_user_from_token(request))["user_id"] == "user-1"
+    assert await server.logout(request) == {"success": True}
+
+    with pytest.raises(HTTPException) as exc_info:
+        await server._get_user_from_token(request)
+    assert exc_info.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_revocation_lookup_only_runs_on_cache_miss(monkeypatch):
+    db = FakeDB()
+    lookups = []
+    find_one = db.revoked_tokens.find_one
+
+    async def counting_find_one(query, projection=None):
+        lookups.append(query)
+        return await find_one(query, projection)
+
+    monkeypatch.setattr(db.revoked_tokens, "find_one", counting_find_one)
+    request = make_request(db, server._create_token("user-1", "alice"))
+
+    for _ in range(4):
+        assert (await server._get_user_from_token(request))["user_id"] == "user-1"
+
+    assert len(lookups) == 1
+
+
+@pytest.mark.asyncio
+async def test_logout_without_jti_is_not_reported_as_success():
+    db = FakeDB()
+    token = sign_payload({"user_id": "user-1", "username": "alice", "exp": 4102444800})
+
+    result = await server.logout(make_request(db, token))
+
+    assert result["success"] is False
+    assert db.revoked_tokens.docs == []
+
+
+@pytest.fixture
+def login_state():
+    server._login_cache.clear()
+    server._failed_logins.clear()
+    yield
+    server._login_cache.clear()
+    server._failed_logins.clear()
+
+
+async def make_user_db(email, password):
+    db = FakeDB()
+    hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=4)).decode("utf-8")
+    await db.users.insert_one({"id": "user-1", "email": email, "username": "alice", "password": hashed})
+    return db
+
+
+@pytest.mark.asyncio
+async def test_concurrent_failed_logins_are_throttled(login_state, monkeypatch):
+    db = await make_user_db("alice@example.com", "correct-password")
+    checks = []
+    checkpw = bcrypt.checkpw
+
+    def counting_checkpw(password, hashed):
+        checks.append(password)
+        return checkpw(password, hashed)
+
+    monkeypatch.setattr(server.bcrypt, "checkpw", counting_checkpw)
+    credentials = server.UserLogin(email="alice@example.com", password="wrong-password")
+
+    results = await asyncio.gather(*(server.login(credentials, make_request(db)) for _ in range(30)))
+
+    assert not any(result.success for result in results)
+    assert len(checks) == server.MAX_FAILED_LOGINS
+    assert sum(result.error.startswith("Too many") for result in results) == 30 - server.MAX_FAILED_LOGINS
+
+
+@pytest.mark.asyncio
+async def test_concurrent_correct_logins_all_succeed(login_state, monkeypatch):
+    db = await make_user_db("alice@example.com", "correct-password")
+    checks = []
+    checkpw = bcrypt.checkpw
+
+    def counting_checkpw(password, hashed):
+        checks.append(password)
+        return checkpw(password, hashed)
+
+    monkeypatch.setattr(server.bcrypt, "checkpw", counting_checkpw)
+    credentials = server.UserLogin(email="alice@example.com", password="correct-password")
+
+    results = await asyncio.gather(*(server.login(credentials, make_request(db)) for _ in range(7)))
+
+    assert [result.success for result in results] == [True] * 7
+    assert len(checks) == 1
+    assert server._login_locks == {}
+
+
+@pytest.mark.asyncio
+async def test_failures_from_one_client_do_not_lock_out_another(login_state):
+    db = await make_user_db("alice@example.com", "correct-password")
+    attacker = make_request(db)
+    attacker.client = SimpleNamespace(host="203.0.113.7")
+    owner = make_request(db)
+    owner.client = SimpleNamespace(host="198.51.100.2")
+
+    for _ in range(server.MAX_FAILED_LOGINS):
+        await server.login(server.UserLogin(email="alice@example.com", password="wrong-password"), attacker)
+    locked = await server.login(server.UserLogin(email="alice@example.com", password="wrong-password"), attacker)
+    result = await server.login(server.UserLogin(email="alice@example.com", password="correct-password"), owner)
+
+    assert locked.error.startswith("Too many")
+    assert result.success
+
+
+@pytest.mark.asyncio
+async def test_successful_login_clears_failures(login_state):
+    db = await make_user_db("alice@example.com", "correct-password")
+    request = make_request(db)
+
+    for _ in range(server.MAX_FAILED_LOGINS - 1):
+        await server.login(server.UserLogin(email="alice@example.com", password="wrong-password"), request)
+    result = await server.login(server.UserLogin(email="alice@example.com", password="correct-password"), request)
+
+    assert result.success
+    assert server._login_throttle_key("alice@example.com", request) not in server._failed_logins
+
+
+@pytest.mark.asyncio
+async def test_duplicate_signup_skips_hashing(monkeypatch):
+    db = await make_user_db("alice@example.com", "correct-password")
+    hashes = []
+    monkeypatch.setattr(server.bcrypt, "hashpw", lambda password, salt: hashes.append(password))
+
+    result = await server.signup(
+        server.UserSignup(email="alice@example.com", username="alice2", password="another-password"),
+        make_request(db),
+    )
+
+    assert result.error == "Email already registered"
+    assert hashes == []
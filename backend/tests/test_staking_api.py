@@ -113,6 +113,14 @@ def test_auth_and_staking():
     assert response.status_code == 401, "Should return 401 for unauthorized access"
     print(f"✓ Unauthorized access properly rejected")
 
+    # Test logout revokes the token
+    print("\nTesting logout...")
+    response = requests.post(f"{BASE_URL}/auth/logout", headers=headers)
+    assert response.status_code == 200, f"Logout failed: {response.text}"
+    response = requests.get(f"{BASE_URL}/staking/overview", headers=headers)
+    assert response.status_code == 401, "Revoked token should return 401"
+    print(f"✓ Logout revoked the token")
+
     print("\n✅ All staking API tests passed!")
 
 if __name__ == "__main__":
@@ -64,6 +64,11 @@ export default function DashboardPage() {
   };
 
   const handleLogout = () => {
+    const token = localStorage.getItem('token');
+    if (token) {
+      axios.post(`${API}/auth/logout`, null, { headers: { Authorization: `Bearer ${token}` } })
+        .catch((error) => console.error('Error logging out:', error));
+    }
     localStorage.removeItem('token');
     localStorage.removeItem('username');
     navigate('/');